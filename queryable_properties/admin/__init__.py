@@ -28,6 +28,9 @@ class QueryablePropertiesAdminMixin(object):
 
     def __init__(self, *args, **kwargs):
         super(QueryablePropertiesAdminMixin, self).__init__(*args, **kwargs)
+        # Caches processed list filter sequences since processing them is
+        # relatively expensive and would otherwise happen on every request.
+        self._processed_list_filters = {}
         if hasattr(self, 'list_filter') and not hasattr(ModelAdmin, 'get_list_filter'):  # pragma: no cover
             # In very old Django versions, there was no get_list_filter method,
             # therefore the processed queryable property filters must be stored
@@ -72,8 +75,11 @@ class QueryablePropertiesAdminMixin(object):
         # The base method has different names in different Django versions (see
         # comment on the constant definition).
         base_method = getattr(super(QueryablePropertiesAdminMixin, self), ADMIN_QUERYSET_METHOD_NAME)
-        # Make sure to use a queryset with queryable properties features.
-        queryset = QueryablePropertiesQuerySetMixin.apply_to(base_method(request))
+        queryset = base_method(request)
+        # Make sure to use a queryset with queryable properties features. The
+        # queryset is only copied if it doesn't offer them already.
+        if not isinstance(queryset, QueryablePropertiesQuerySetMixin):
+            queryset = QueryablePropertiesQuerySetMixin.apply_to(queryset)
         # Apply list_select_properties.
         list_select_properties = self.get_list_select_properties(request)
         if list_select_properties:
@@ -101,6 +107,12 @@ class QueryablePropertiesAdminMixin(object):
 
     def get_list_filter(self, request):
         list_filter = super(QueryablePropertiesAdminMixin, self).get_list_filter(request)
+        # Sequences that only consist of filter classes can't contain
+        # queryable property references and don't need to be processed. A new
+        # list is still returned (like for processed sequences) as callers may
+        # modify the result, which must not affect the admin's attributes.
+        if all(callable(item) for item in list_filter):
+            return list(list_filter)
         return self.process_queryable_property_filters(list_filter)
 
     def process_queryable_property_filters(self, list_filter):
@@ -109,23 +121,30 @@ class QueryablePropertiesAdminMixin(object):
         queryable property references are replaced with custom callables that
         make them compatible with Django's filter workflow.
 
+        Processed sequences are cached on this admin instance, which is why
+        the returned list is always a new list object.
+
         :param collections.Sequence list_filter: The list filter sequence.
         :return: The processed list filter sequence.
         :rtype: list
         """
-        processed_filters = []
-        for item in list_filter:
-            if not callable(item):
-                if isinstance(item, (tuple, list)):
-                    field_name, filter_class = item
-                else:
-                    field_name, filter_class = item, None
-                try:
-                    item = QueryablePropertyField(self, QueryPath(field_name)).get_filter_creator(filter_class)
-                except QueryablePropertyError:
-                    pass
-            processed_filters.append(item)
-        return processed_filters
+        cache_key = tuple(tuple(item) if isinstance(item, list) else item for item in list_filter)
+        processed_filters = self._processed_list_filters.get(cache_key)
+        if processed_filters is None:
+            processed_filters = []
+            for item in list_filter:
+                if not callable(item):
+                    if isinstance(item, (tuple, list)):
+                        field_name, filter_class = item
+                    else:
+                        field_name, filter_class = item, None
+                    try:
+                        item = QueryablePropertyField(self, QueryPath(field_name)).get_filter_creator(filter_class)
+                    except QueryablePropertyError:
+                        pass
+                processed_filters.append(item)
+            self._processed_list_filters[cache_key] = processed_filters
+        return list(processed_filters)
 
 
 class QueryablePropertiesAdmin(QueryablePropertiesAdminMixin, ModelAdmin):
@@ -12,7 +12,7 @@ from django.utils.functional import cached_property
 from .compat import (
     ANNOTATION_SELECT_CACHE_NAME, ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP, MANAGER_QUERYSET_METHOD_NAME, DateQuerySet,
     DateTimeQuerySet, ModelIterable, RawModelIterable, RawQuery, ValuesListQuerySet, ValuesQuerySet, chain_query,
-    chain_queryset,
+    chain_queryset, contains_aggregate,
 )
 from .exceptions import QueryablePropertyDoesNotExist, QueryablePropertyError
 from .query import QUERYING_PROPERTIES_MARKER, QueryablePropertiesQueryMixin
@@ -99,8 +99,7 @@ class LegacyOrderingMixin(QueryablePropertiesIterableMixin):
         """
         query = self.queryset.query
         occurrences = {}
-        for ref in query._queryable_property_annotations:
-            annotation_name = six.text_type(ref.full_path)
+        for ref, annotation_name in six.iteritems(query._queryable_property_annotations):
             indexes = [index for index, field_name in enumerate(query.order_by)
                        if field_name in (annotation_name, '-{}'.format(annotation_name))]
             if indexes:
@@ -119,8 +118,8 @@ class LegacyOrderingMixin(QueryablePropertiesIterableMixin):
         """
         query = self.queryset.query
         select = set()
-        for ref, occurrences in six.iteritems(self._order_by_occurrences):
-            annotation_name = six.text_type(ref.full_path)
+        for ref in self._order_by_occurrences:
+            annotation_name = query._queryable_property_annotations[ref]
             if annotation_name not in query.annotation_select and annotation_name in query.annotations:
                 select.add(ref)
         return select
@@ -357,15 +356,20 @@ class QueryablePropertiesQuerySetMixin(QueryablePropertiesBaseQuerySetMixin):
         :rtype: QuerySet
         """
         queryset = chain_queryset(self)
+        # A full GROUP BY is required if the query is not limited to certain
+        # fields. Since only certain types of queries had the _fields attribute
+        # in old Django versions, fall back to checking for existing selection,
+        # on which the GROUP BY would be based.
+        full_group_by = not getattr(self, '_fields', self.query.select)
+        requires_group_by = False
         for name in names:
             property_ref = QueryablePropertyReference(get_queryable_property(self.model, name), self.model, QueryPath())
-            # A full GROUP BY is required if the query is not limited to
-            # certain fields. Since only certain types of queries had the
-            # _fields attribute in old Django versions, fall back to checking
-            # for existing selection, on which the GROUP BY would be based.
-            full_group_by = not getattr(self, '_fields', self.query.select)
-            with queryset.query._add_queryable_property_annotation(property_ref, full_group_by, select=True):
-                pass
+            # The GROUP BY setup is only performed once after adding all
+            # annotations instead of after each aggregate-based annotation.
+            with queryset.query._add_queryable_property_annotation(property_ref, None, select=True) as annotation:
+                requires_group_by = requires_group_by or contains_aggregate(annotation)
+        if requires_group_by:
+            queryset.query._setup_queryable_property_group_by(full_group_by)
         return queryset
 
     def iterator(self, *args, **kwargs):
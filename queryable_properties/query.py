@@ -8,8 +8,8 @@ from django.utils.tree import Node
 
 from .compat import (
     ADD_Q_METHOD_NAME, ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP, BUILD_FILTER_METHOD_NAME, NAMES_TO_PATH_METHOD_NAME,
-    NEED_HAVING_METHOD_NAME, QUERY_CHAIN_METHOD_NAME, ValuesQuerySet, contains_aggregate,
-    convert_build_filter_to_add_q_kwargs, nullcontext,
+    NEED_HAVING_METHOD_NAME, QUERY_CHAIN_METHOD_NAME, Ref, ValuesQuerySet, contains_aggregate,
+    convert_build_filter_to_add_q_kwargs,
 )
 from .exceptions import QueryablePropertyError
 from .utils.internal import InjectableMixin, NodeChecker, QueryPath, resolve_queryable_property
@@ -65,24 +65,29 @@ class QueryablePropertiesCompilerMixin(InjectableMixin):
     def setup_query(self, *args, **kwargs):
         super(QueryablePropertiesCompilerMixin, self).setup_query(*args, **kwargs)
         # Add the marker to the column map while ensuring that it's the first
-        # entry.
-        annotation_col_map = OrderedDict()
+        # entry. The mapping type used by Django is kept, which is a regular
+        # (ordered) dict in recent versions and an OrderedDict in old ones.
+        annotation_col_map = self.annotation_col_map.__class__()
         annotation_col_map[QUERYING_PROPERTIES_MARKER] = -1
         annotation_col_map.update(self.annotation_col_map)
         self.annotation_col_map = annotation_col_map
 
     def results_iter(self, *args, **kwargs):
+        addition = index = None
         for row in super(QueryablePropertiesCompilerMixin, self).results_iter(*args, **kwargs):
             # Add the fixed value for the fake querying properties marker
             # annotation to each row. In recent versions, the value can simply
             # be appended since -1 can be specified as the index in the
             # annotation_col_map. In old versions, the value must be injected
-            # as the first annotation value.
-            addition = row.__class__((True,))
-            if not ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP:
+            # as the first annotation value. All rows share the same type and
+            # length, so the addition and the index are only determined once.
+            if addition is None:
+                addition = row.__class__((True,))
+                if ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP:  # pragma: no cover
+                    index = len(row) - len(self.query.aggregate_select) - len(self.query.related_select_cols)
+            if index is None:
                 row += addition
             else:  # pragma: no cover
-                index = len(row) - len(self.query.aggregate_select) - len(self.query.related_select_cols)
                 row = row[:index] + addition + row[index:]
             yield row
 
@@ -95,30 +100,74 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
     properties or automatically adding required properties as annotations.
     """
 
-    def __getattr__(self, name):  # pragma: no cover
+    if ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP:  # pragma: no cover
         # Redirect some attribute accesses for older Django versions (where
         # annotations were tied to aggregations, hence "aggregation" in the
-        # names instead of "annotation").
-        if name in ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP:
-            return getattr(self, ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP[name])
-        raise AttributeError()
+        # names instead of "annotation"). Only defined if necessary since it
+        # would otherwise slow down every failed attribute lookup on queries.
+        def __getattr__(self, name):
+            if name in ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP:
+                return getattr(self, ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP[name])
+            raise AttributeError()
 
     def __iter__(self):  # Raw queries
         # See QueryablePropertiesCompilerMixin.results_iter, but for raw
         # queries. The marker can simply be added as the first value as fields
         # are not strictly grouped like in regular queries.
-        for row in super(QueryablePropertiesQueryMixin, self).__iter__():
-            if self._use_querying_properties_marker:
-                row = row.__class__((True,)) + row
-            yield row
+        rows = super(QueryablePropertiesQueryMixin, self).__iter__()
+        if not self._use_querying_properties_marker:
+            for row in rows:
+                yield row
+            return
+        addition = None
+        for row in rows:
+            if addition is None:
+                addition = row.__class__((True,))
+            yield addition + row
+
+    @classmethod
+    def _get_class_attrs(cls, base_class):
+        attrs = super(QueryablePropertiesQueryMixin, cls)._get_class_attrs(base_class)
+        # The base methods required to build filters and resolve names have
+        # different names in different Django versions (see comments on the
+        # constant definitions). Resolve them once per created class to avoid
+        # name-based lookups via super objects on every call. Raw queries don't
+        # offer these methods at all.
+        for attr_name, method_name in (('_base_build_filter', BUILD_FILTER_METHOD_NAME),
+                                       ('_base_names_to_path', NAMES_TO_PATH_METHOD_NAME)):
+            method = getattr(base_class, method_name, None)
+            if method is not None:
+                attrs[attr_name] = six.get_unbound_function(method)
+        return attrs
 
     def init_injected_attrs(self):
         # Stores references to queryable properties used as annotations in this
-        # query.
-        self._queryable_property_annotations = set()
+        # query, mapped to the names of their annotations. The dictionary is
+        # never modified in place but replaced when adding annotations, which
+        # allows clones to share it.
+        self._queryable_property_annotations = {}
+        # Caches the results of resolving query paths into queryable
+        # properties since the same paths are usually resolved multiple times
+        # while building a query (filters, annotations, ordering, ...). The
+        # dictionary may be shared with clones, in which case it is copied
+        # before adding new entries (see _resolve_queryable_property).
+        self._queryable_property_resolutions = {}
+        self._queryable_property_resolutions_shared = False
+        self._init_queryable_property_state()
+
+    def _init_queryable_property_state(self):
+        """
+        Initialize the attributes that represent the state of queryable
+        properties while a query is being built or executed. In contrast to the
+        queryable property mappings, they must never be shared with clones.
+        """
         # A stack for queryable properties who are currently being annotated.
         # Required to correctly resolve dependencies and perform annotations.
         self._queryable_property_stack = []
+        # The reference on top of the stack (or None if the stack is empty).
+        # Kept as a separate attribute since it's checked in various hot paths
+        # (e.g. names_to_path, which is called for each referenced field).
+        self._queryable_property_stack_top = None
         # Determines whether to inject the QUERYING_PROPERTIES_MARKER.
         self._use_querying_properties_marker = False
 
@@ -135,9 +184,12 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         :param property_ref: A reference containing the queryable property
                              to annotate.
         :type property_ref: queryable_properties.utils.internal.QueryablePropertyReference
-        :param bool full_group_by: Signals whether to use all fields of the
-                                   query for the GROUP BY clause when dealing
-                                   with an aggregate-based annotation or not.
+        :param bool | None full_group_by: Signals whether to use all fields of
+                                          the query for the GROUP BY clause
+                                          when dealing with an aggregate-based
+                                          annotation or not. May be None to
+                                          skip the GROUP BY setup, which must
+                                          then be performed by the caller.
         :param bool select: Signals whether the annotation should be selected
                             or not.
         """
@@ -145,36 +197,60 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
             raise QueryablePropertyError('Queryable property "{}" has a circular dependency and requires itself.'
                                          .format(property_ref.property))
 
-        annotation_name = six.text_type(property_ref.full_path)
-        annotation_mask = set(self.annotations if self.annotation_select_mask is None else self.annotation_select_mask)
+        # Reuse the stored name of an existing annotation to avoid building the
+        # full path string again.
+        annotation_name = self._queryable_property_annotations.get(property_ref)
+        previous_top = self._queryable_property_stack_top
         self._queryable_property_stack.append(property_ref)
+        self._queryable_property_stack_top = property_ref
         try:
-            if property_ref not in self._queryable_property_annotations:
-                self.add_annotation(property_ref.get_annotation(), alias=annotation_name)
+            if annotation_name is None:
+                annotation_name = six.text_type(property_ref.full_path)
+                # The current select mask must be captured before adding a
+                # non-selected annotation to be able to restore it afterwards.
+                annotation_mask = None
                 if not select:
+                    annotation_mask = set(self.annotations if self.annotation_select_mask is None
+                                          else self.annotation_select_mask)
+                self.add_annotation(property_ref.get_annotation(), alias=annotation_name)
+                if annotation_mask is not None:
                     self.set_annotation_mask(annotation_mask)
-                self._queryable_property_annotations.add(property_ref)
+                annotations = dict(self._queryable_property_annotations)
+                annotations[property_ref] = annotation_name
+                self._queryable_property_annotations = annotations
             elif select and self.annotation_select_mask is not None:
-                self.set_annotation_mask(annotation_mask.union((annotation_name,)))
+                self.set_annotation_mask(set(self.annotation_select_mask).union((annotation_name,)))
             annotation = self.annotations[annotation_name]
             yield annotation
         finally:
             self._queryable_property_stack.pop()
+            self._queryable_property_stack_top = previous_top
+
+        if full_group_by is not None and contains_aggregate(annotation):
+            self._setup_queryable_property_group_by(full_group_by)
 
-        # Perform the required GROUP BY setup if the annotation contained
-        # aggregates, which is normally done by QuerySet.annotate.
-        if contains_aggregate(annotation):
-            if full_group_by and not ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP:
-                # In recent Django versions, a full GROUP BY can be achieved by
-                # simply setting group_by to True.
-                self.group_by = True
-            else:
-                if full_group_by and self.group_by is None:  # pragma: no cover
-                    # In old versions, the fields must be added to the selected
-                    # fields manually and set_group_by must be called after.
-                    opts = self.model._meta
-                    self.add_fields([f.attname for f in getattr(opts, 'concrete_fields', opts.fields)], False)
-                self.set_group_by()
+    def _setup_queryable_property_group_by(self, full_group_by):
+        """
+        Perform the GROUP BY setup required after adding aggregate-based
+        queryable property annotations, which is normally done by
+        QuerySet.annotate. The setup only has to be performed once after
+        adding multiple annotations as the GROUP BY clause is always built from
+        the current state of the query.
+
+        :param bool full_group_by: Signals whether to use all fields of the
+                                   query for the GROUP BY clause or not.
+        """
+        if full_group_by and not ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP:
+            # In recent Django versions, a full GROUP BY can be achieved by
+            # simply setting group_by to True.
+            self.group_by = True
+        else:
+            if full_group_by and self.group_by is None:  # pragma: no cover
+                # In old versions, the fields must be added to the selected
+                # fields manually and set_group_by must be called after.
+                opts = self.model._meta
+                self.add_fields([f.attname for f in getattr(opts, 'concrete_fields', opts.fields)], False)
+            self.set_group_by()
 
     def _auto_annotate(self, query_path, full_group_by=None):
         """
@@ -183,7 +259,7 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         as an annotation already). Do nothing if the path does not match a
         queryable property.
 
-        :param QueryPath query_path: The query path to resolve.
+        :param str | QueryPath query_path: The query path to resolve.
         :param bool | None full_group_by: Optional override to indicate whether
                                           or not all fields must be contained
                                           in a GROUP BY clause for aggregate
@@ -193,7 +269,7 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         :return: The resolved annotation or None if the path couldn't be
                  resolved.
         """
-        property_ref = resolve_queryable_property(self.model, query_path)[0]
+        property_ref = self._resolve_queryable_property(query_path)[0]
         if not property_ref:
             return None
         if full_group_by is None:
@@ -201,6 +277,33 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         with self._add_queryable_property_annotation(property_ref, full_group_by) as annotation:
             return annotation
 
+    def _resolve_queryable_property(self, query_path):
+        """
+        Resolve the given path into a queryable property on the model of this
+        query. Results are cached per query as the outcome only depends on the
+        model and the path. The cache is shared with clones until either query
+        resolves a new path, which ensures that clones never add entries to the
+        cache of the query they were cloned from. Paths may also be passed as
+        strings, in which case they are only split up when they haven't been
+        resolved before.
+
+        :param str | QueryPath query_path: The query path to resolve.
+        :return: A 2-tuple containing a queryable property reference for the
+                 resolved property and a query path containing the parts of
+                 the path that represent lookups (or transforms). The first
+                 item will be None and the query path will be empty if no
+                 queryable property could be resolved.
+        :rtype: (queryable_properties.utils.internal.QueryablePropertyReference | None, QueryPath)
+        """
+        result = self._queryable_property_resolutions.get(query_path)
+        if result is None:
+            result = resolve_queryable_property(self.model, QueryPath(query_path))
+            if self._queryable_property_resolutions_shared:
+                self._queryable_property_resolutions = dict(self._queryable_property_resolutions)
+                self._queryable_property_resolutions_shared = False
+            self._queryable_property_resolutions[query_path] = result
+        return result
+
     def _postprocess_clone(self, clone):
         """
         Postprocess a query that was the result of cloning this query. This
@@ -211,9 +314,11 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         :return: The postprocessed cloned query.
         :rtype: django.db.models.sql.Query
         """
-        QueryablePropertiesQueryMixin.inject_into_object(clone)
-        clone.init_injected_attrs()
-        clone._queryable_property_annotations.update(self._queryable_property_annotations)
+        QueryablePropertiesQueryMixin.inject_into_object(clone, init=False)
+        clone._init_queryable_property_state()
+        clone._queryable_property_annotations = self._queryable_property_annotations
+        clone._queryable_property_resolutions = self._queryable_property_resolutions
+        clone._queryable_property_resolutions_shared = self._queryable_property_resolutions_shared = True
         return clone
 
     def add_aggregate(self, aggregate, model=None, alias=None, is_summary=False):  # pragma: no cover
@@ -221,8 +326,8 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         # may be based on a queryable property annotation, which in turn must
         # be auto-annotated here.
         query_path = QueryPath(aggregate.lookup)
-        if self._queryable_property_stack:
-            query_path = self._queryable_property_stack[-1].relation_path + query_path
+        if self._queryable_property_stack_top is not None:
+            query_path = self._queryable_property_stack_top.relation_path + query_path
         property_annotation = self._auto_annotate(query_path)
         if property_annotation:
             # If it is based on a queryable property annotation, annotating the
@@ -238,18 +343,18 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         if self.annotation_select_mask is not None:
             self.set_annotation_mask(self.annotation_select_mask.union((alias,)))
 
-    def add_filter(self, *args, **kwargs):  # pragma: no cover
+    if BUILD_FILTER_METHOD_NAME == 'add_filter':  # pragma: no cover
         # The build_filter method was called add_filter in very old Django
         # versions. Since recent versions still have an add_filter method (for
         # different purposes), the queryable properties customizations should
-        # only occur in old versions.
-        if BUILD_FILTER_METHOD_NAME == 'add_filter':
+        # only occur in old versions, which is why the method is only
+        # overridden in this case.
+        def add_filter(self, *args, **kwargs):
             # Simply use the build_filter implementation that does all the
             # heavy lifting and is aware of the different methods in different
             # versions and therefore calls the correct super methods if
             # necessary.
             return self.build_filter(*args, **kwargs)
-        return super(QueryablePropertiesQueryMixin, self).add_filter(*args, **kwargs)
 
     def add_ordering(self, *ordering, **kwargs):
         for field_name in ordering:
@@ -260,7 +365,7 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
             if isinstance(field_name, six.string_types) and field_name != '?':
                 if field_name.startswith('-'):
                     field_name = field_name[1:]
-                self._auto_annotate(QueryPath(field_name))
+                self._auto_annotate(field_name)
         return super(QueryablePropertiesQueryMixin, self).add_ordering(*ordering, **kwargs)
 
     @property
@@ -288,7 +393,7 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
             # and delegate it to Django.
             property_ref = None
         else:
-            property_ref, lookups = resolve_queryable_property(self.model, QueryPath(arg))
+            property_ref, lookups = self._resolve_queryable_property(arg)
 
         # If no queryable property could be determined for the filter
         # expression (either because a regular/non-existent field is referenced
@@ -296,39 +401,37 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         # Django's default implementation, which may in turn raise an
         # exception. Act the same way if the current top of the stack is used
         # to avoid infinite recursions.
-        if not property_ref or (self._queryable_property_stack and self._queryable_property_stack[-1] == property_ref):
-            # The base method has different names in different Django versions
-            # (see comment on the constant definition).
-            base_method = getattr(super(QueryablePropertiesQueryMixin, self), BUILD_FILTER_METHOD_NAME)
-            return base_method(filter_expr, *args, **kwargs)
+        if not property_ref or property_ref == self._queryable_property_stack_top:
+            return self._base_build_filter(filter_expr, *args, **kwargs)
 
         q_obj = property_ref.get_filter(lookups, value)
-        # Before applying the filter implemented by the property, check if
-        # the property signals the need of its own annotation to function.
-        # If so, add the annotation first to avoid endless recursion, since
-        # resolved filter will likely contain the same property name again.
-        context = nullcontext()
-        if property_ref.property.filter_requires_annotation:
-            full_group_by = bool(ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP) and not self.select
-            context = self._add_queryable_property_annotation(property_ref, full_group_by)
-
-        with context:
-            # Luckily, build_filter and _add_q use the same return value
-            # structure, so an _add_q call can be used to actually create the
-            # return value for the current call. The (_)add_q method has
-            # different names in different Django versions (see comment on the
-            # constant definition).
-            method = getattr(self, ADD_Q_METHOD_NAME)
-            return method(q_obj, **convert_build_filter_to_add_q_kwargs(**kwargs))
+        # Luckily, build_filter and _add_q use the same return value structure,
+        # so an _add_q call can be used to actually create the return value for
+        # the current call. The (_)add_q method has different names in
+        # different Django versions (see comment on the constant definition).
+        # It's intentionally looked up on the query itself to respect
+        # overrides in subclasses.
+        add_q = getattr(self, ADD_Q_METHOD_NAME)
+        add_q_kwargs = convert_build_filter_to_add_q_kwargs(**kwargs)
+        if not property_ref.property.filter_requires_annotation:
+            return add_q(q_obj, **add_q_kwargs)
+
+        # The property signals the need of its own annotation to function, so
+        # the annotation must be added before applying the filter to avoid
+        # endless recursion, since the resolved filter will likely contain the
+        # same property name again.
+        full_group_by = bool(ANNOTATION_TO_AGGREGATE_ATTRIBUTES_MAP) and not self.select
+        with self._add_queryable_property_annotation(property_ref, full_group_by):
+            return add_q(q_obj, **add_q_kwargs)
 
     def get_aggregation(self, *args, **kwargs):
         # If the query is to be used as a pure aggregate query (which might use
         # a subquery), all queryable property annotations must be added to the
         # select mask to avoid potentially empty SELECT clauses.
         if self.annotation_select_mask is not None and self._queryable_property_annotations:
-            annotation_names = (six.text_type(property_ref.full_path) for property_ref
-                                in self._queryable_property_annotations)
-            self.set_annotation_mask(set(self.annotation_select_mask).union(annotation_names))
+            annotation_mask = set(self.annotation_select_mask)
+            annotation_mask.update(six.itervalues(self._queryable_property_annotations))
+            self.set_annotation_mask(annotation_mask)
         return super(QueryablePropertiesQueryMixin, self).get_aggregation(*args, **kwargs)
 
     def get_columns(self):  # Raw queries
@@ -352,11 +455,12 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         # This is a central method for resolving field names. To also allow the
         # use of queryable properties across relations, the relation path on
         # top of the stack must be prepended to trick Django into resolving
-        # correctly.
-        if self._queryable_property_stack:
-            names = self._queryable_property_stack[-1].relation_path + names
-        base_method = getattr(super(QueryablePropertiesQueryMixin, self), NAMES_TO_PATH_METHOD_NAME)
-        return base_method(names, *args, **kwargs)
+        # correctly. Most properties aren't referenced across relations, in
+        # which case the names can be passed on as they are.
+        top = self._queryable_property_stack_top
+        if top is not None and top.relation_path:
+            names = top.relation_path + names
+        return self._base_names_to_path(names, *args, **kwargs)
 
     def need_force_having(self, q_object):  # pragma: no cover
         # Same as need_having, but for even older versions. Simply delegate to
@@ -382,37 +486,37 @@ class QueryablePropertiesQueryMixin(InjectableMixin):
         # This method is used to resolve field names in complex expressions. If
         # a queryable property is used in such an expression, it needs to be
         # auto-annotated (while taking the stack into account) and returned.
-        query_path = QueryPath(name)
-        if self._queryable_property_stack:
-            query_path = self._queryable_property_stack[-1].relation_path + query_path
+        query_path = name
+        top = self._queryable_property_stack_top
+        if top is not None and top.relation_path:
+            query_path = top.relation_path + query_path
         property_annotation = self._auto_annotate(query_path, full_group_by=ValuesQuerySet is not None)
         if property_annotation:
             if summarize:
                 # Outer queries for aggregations need refs to annotations of
                 # the inner queries.
-                from django.db.models.expressions import Ref
                 return Ref(name, property_annotation)
             return property_annotation
         return super(QueryablePropertiesQueryMixin, self).resolve_ref(name, allow_joins, reuse, summarize,
                                                                       *args, **kwargs)
 
-    def setup_joins(self, names, *args, **kwargs):
+    if NAMES_TO_PATH_METHOD_NAME == 'setup_joins':  # pragma: no cover
         # This method contained the logic of names_to_path in very old Django
         # versions. Simply delegate to the overridden names_to_path in this
         # case, which is aware of the different methods in different versions
-        # and therefore calls the correct super method.
-        if NAMES_TO_PATH_METHOD_NAME == 'setup_joins':  # pragma: no cover
+        # and therefore calls the correct super method. The method is only
+        # overridden in this case since it's called for every join setup.
+        def setup_joins(self, names, *args, **kwargs):
             return self.names_to_path(names, *args, **kwargs)
-        return super(QueryablePropertiesQueryMixin, self).setup_joins(names, *args, **kwargs)
-
-    def clone(self, *args, **kwargs):
-        obj = super(QueryablePropertiesQueryMixin, self).clone(*args, **kwargs)
-        if QUERY_CHAIN_METHOD_NAME == 'clone':  # pragma: no cover
-            obj = self._postprocess_clone(obj)
-        return obj
-
-    def chain(self, *args, **kwargs):
-        obj = super(QueryablePropertiesQueryMixin, self).chain(*args, **kwargs)
-        if QUERY_CHAIN_METHOD_NAME == 'chain':
-            obj = self._postprocess_clone(obj)
-        return obj
+
+    # Only override the method that is used to chain queries in the current
+    # Django version. In recent versions, chain calls clone internally, so an
+    # additional clone override would only add overhead to every copy.
+    if QUERY_CHAIN_METHOD_NAME == 'clone':  # pragma: no cover
+        def clone(self, *args, **kwargs):
+            obj = super(QueryablePropertiesQueryMixin, self).clone(*args, **kwargs)
+            return self._postprocess_clone(obj)
+    else:
+        def chain(self, *args, **kwargs):
+            obj = super(QueryablePropertiesQueryMixin, self).chain(*args, **kwargs)
+            return self._postprocess_clone(obj)
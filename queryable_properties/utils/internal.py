@@ -5,7 +5,7 @@ without notice or be removed without deprecation.
 """
 
 from collections import namedtuple
-from copy import deepcopy
+from copy import copy as copy_object
 from functools import wraps
 
 import six
@@ -40,6 +40,10 @@ class QueryPath(tuple):
         :param collections.Iterable path: The query path to represent as string
                                           or other iterable.
         """
+        # Query paths are immutable, so existing instances can be reused
+        # instead of being copied (just like tuple() does for tuples).
+        if path.__class__ is cls:
+            return path
         if isinstance(path, six.string_types):
             path = path.split(LOOKUP_SEP)
         return super(QueryPath, cls).__new__(cls, path)
@@ -104,12 +108,19 @@ class NodeProcessor(object):
                  of that leaf and the leaf item itself.
         :rtype: collections.Iterable[Node, int, object]
         """
-        for index, child in enumerate(node.children):
-            if isinstance(child, Node):
-                for result in self.iter_leaves(child):
-                    yield result
+        # Walk the tree using an explicit stack instead of recursive
+        # generators, which would pass each leaf through one generator per
+        # level of nesting.
+        stack = [(node, enumerate(node.children))]
+        while stack:
+            branch_node, children = stack[-1]
+            for index, child in children:
+                if isinstance(child, Node):
+                    stack.append((child, enumerate(child.children)))
+                    break
+                yield branch_node, index, child
             else:
-                yield node, index, child
+                stack.pop()
 
 
 class NodeChecker(NodeProcessor):
@@ -158,11 +169,33 @@ class NodeModifier(NodeProcessor):
         :rtype: Node
         """
         if copy:
-            node = deepcopy(node)
+            node = self.copy_branches(node)
         for branch_node, index, leaf in self.iter_leaves(node):
             branch_node.children[index] = self.func(leaf, **context)
         return node
 
+    @staticmethod
+    def copy_branches(node):
+        """
+        Create a copy of the given node and all of its sub-nodes. The leaves
+        themselves are not copied since they are replaced rather than modified,
+        which avoids deep-copying potentially expensive filter values.
+
+        :param Node node: The node to copy.
+        :return: The copied node.
+        :rtype: Node
+        """
+        node = copy_object(node)
+        stack = [node]
+        while stack:
+            branch_node = stack.pop()
+            branch_node.children = list(branch_node.children)
+            for index, child in enumerate(branch_node.children):
+                if isinstance(child, Node):
+                    branch_node.children[index] = child = copy_object(child)
+                    stack.append(child)
+        return node
+
 
 class QueryablePropertyReference(namedtuple('QueryablePropertyReference', 'property model relation_path')):
     """
@@ -286,7 +319,7 @@ class InjectableMixin(object):
         cache_key = (base_class, cls, class_name)
         created_class = cls._created_classes.get(cache_key)
         if created_class is None:
-            attrs = {}
+            attrs = cls._get_class_attrs(base_class)
             metaclass = type
             if (not issubclass(cls.__class__, base_class.__class__) and
                     not issubclass(base_class.__class__, cls.__class__)):
@@ -303,6 +336,20 @@ class InjectableMixin(object):
             created_class = cls._created_classes[cache_key] = metaclass(class_name, (cls, base_class), attrs)
         return created_class
 
+    @classmethod
+    def _get_class_attrs(cls, base_class):
+        """
+        Build additional class attributes for a class that is dynamically
+        created based on the given base class and this mixin class. This is
+        called only once per created class, which makes it suitable to resolve
+        attributes that would otherwise be determined on every access.
+
+        :param type base_class: The base class the mixin is mixed into.
+        :return: The class attributes for the dynamically created class.
+        :rtype: dict
+        """
+        return {}
+
     @classmethod
     def inject_into_object(cls, obj, class_name=None, init=True):
         """
@@ -323,6 +370,13 @@ class InjectableMixin(object):
                           changed.
         :return: The (potentially) modified object.
         """
+        # Objects are often injected repeatedly (e.g. cloned queries). If an
+        # object already uses the mixin, mix_with_class would return its class
+        # unchanged, meaning that the injected attributes wouldn't be
+        # initialized again either. Checking this first is therefore only a
+        # shortcut that doesn't change any semantics.
+        if isinstance(obj, cls):
+            return obj
         new_class = cls.mix_with_class(obj.__class__, class_name)
         if new_class is not obj.__class__:
             obj.__class__ = new_class
@@ -499,6 +553,24 @@ def parametrizable_decorator(function):
 parametrizable_decorator_method = method_decorator(parametrizable_decorator)
 
 
+def find_queryable_property_descriptor(model, name):
+    """
+    Retrieve the descriptor object for the property with the given attribute
+    name from the given model class if a queryable property with that name
+    exists on the model class.
+
+    :param type model: The model class to retrieve the descriptor object from.
+    :param str name: The name of the property to retrieve the descriptor for.
+    :return: The descriptor object or None if there is no queryable property
+             with the given name.
+    :rtype: queryable_properties.properties.base.QueryablePropertyDescriptor | None
+    """
+    from ..properties.base import QueryablePropertyDescriptor
+
+    descriptor = getattr(model, name, None)
+    return descriptor if isinstance(descriptor, QueryablePropertyDescriptor) else None
+
+
 def get_queryable_property_descriptor(model, name):
     """
     Retrieve the descriptor object for the property with the given attribute
@@ -510,10 +582,8 @@ def get_queryable_property_descriptor(model, name):
     :return: The descriptor object.
     :rtype: queryable_properties.properties.base.QueryablePropertyDescriptor
     """
-    from ..properties.base import QueryablePropertyDescriptor
-
-    descriptor = getattr(model, name, None)
-    if not isinstance(descriptor, QueryablePropertyDescriptor):
+    descriptor = find_queryable_property_descriptor(model, name)
+    if descriptor is None:
         raise QueryablePropertyDoesNotExist("{model} has no queryable property named '{name}'".format(
             model=model.__name__, name=name))
     return descriptor
@@ -532,8 +602,6 @@ def resolve_queryable_property(model, query_path):
              could be resolved.
     :rtype: (QueryablePropertyReference | None, QueryPath)
     """
-    from . import get_queryable_property
-
     property_ref, lookups = None, QueryPath()
     # Try to follow the given path to allow to use queryable properties
     # across relations.
@@ -541,14 +609,13 @@ def resolve_queryable_property(model, query_path):
         try:
             related_model = get_related_model(model, name)
         except FieldDoesNotExist:
-            try:
-                prop = get_queryable_property(model, name)
-            except QueryablePropertyDoesNotExist:
-                # Neither a field nor a queryable property, so likely an
-                # invalid name. Do nothing and let Django deal with it.
-                pass
-            else:
-                property_ref = QueryablePropertyReference(prop, model, query_path[:index])
+            # The descriptor is looked up without raising and catching an
+            # exception for names that aren't queryable properties either
+            # (e.g. names of regular annotations), which Django has to deal
+            # with.
+            descriptor = find_queryable_property_descriptor(model, name)
+            if descriptor is not None:
+                property_ref = QueryablePropertyReference(descriptor.prop, model, query_path[:index])
                 lookups = query_path[index + 1:]
             # The current name was not a field and either a queryable
             # property or invalid. Either way, resolving ends here.
@@ -49,6 +49,13 @@ class TestQueryablePropertiesAdminMixin(object):
         for prop in expected_selected_properties:
             assert any(ref.property is prop for ref in queryset.query._queryable_property_annotations)
 
+    def test_get_queryset_no_copy(self, rf):
+        admin = VersionAdmin(VersionWithClassBasedProperties, site)
+        base_queryset = VersionWithClassBasedProperties.objects.all()
+        with patch('django.contrib.admin.options.ModelAdmin.{}'.format(ADMIN_QUERYSET_METHOD_NAME),
+                   return_value=base_queryset):
+            assert admin.get_queryset(rf.get('/')) is base_queryset
+
     @pytest.mark.parametrize('list_filter_item, property_name', [
         ('name', None),
         (DummyListFilter, None),
@@ -70,6 +77,27 @@ class TestQueryablePropertiesAdminMixin(object):
             assert isinstance(filter_instance, FieldListFilter)
             assert filter_instance.field.name == property_name
 
+    @pytest.mark.skipif(DJANGO_VERSION < (1, 5), reason="get_list_filter didn't exist before Django 1.5")
+    def test_get_list_filter_only_callables(self, monkeypatch, rf):
+        monkeypatch.setattr(ApplicationAdmin, 'list_filter', (DummyListFilter,))
+        admin = ApplicationAdmin(ApplicationWithClassBasedProperties, site)
+        list_filter = admin.get_list_filter(rf.get('/'))
+        assert list_filter == [DummyListFilter]
+        assert isinstance(list_filter, list)
+        assert not admin._processed_list_filters
+        list_filter.append('name')
+        assert ApplicationAdmin.list_filter == (DummyListFilter,)
+        assert admin.get_list_filter(rf.get('/')) == [DummyListFilter]
+
+    def test_process_queryable_property_filters_cache(self):
+        admin = ApplicationAdmin(ApplicationWithClassBasedProperties, site)
+        list_filter = ['common_data', ['support_start_date', ChoicesFieldListFilter]]
+        processed_filters = admin.process_queryable_property_filters(list_filter)
+        cached_filters = admin.process_queryable_property_filters(list_filter)
+        assert cached_filters == processed_filters
+        assert cached_filters is not processed_filters
+        assert len(admin._processed_list_filters) == 1
+
     @pytest.mark.skipif(DJANGO_VERSION < (2, 1), reason='Arbitrary search fields were not allowed before Django 2.1')
     @pytest.mark.django_db
     @pytest.mark.parametrize('search_term, expected_count', [
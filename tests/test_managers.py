@@ -85,6 +85,18 @@ class TestQueryablePropertiesQuerySetMixin(object):
         for name, value in kwargs.items():
             assert getattr(clone, name) == value
 
+    @pytest.mark.skipif(DJANGO_VERSION < (1, 9), reason="values() didn't limit the GROUP BY clause in old versions.")
+    def test_select_properties_single_group_by_setup(self):
+        queryset = ApplicationWithClassBasedProperties.objects.values('name')
+        with patch.object(queryset.query.__class__, 'set_group_by', autospec=True,
+                          side_effect=queryset.query.__class__.set_group_by) as mock_set_group_by:
+            queryset = queryset.select_properties('version_count', 'major_sum')
+        mock_set_group_by.assert_called_once_with(queryset.query)
+        assert list(queryset.order_by('name')) == [
+            {'name': 'Another App', 'version_count': 4, 'major_sum': 5},
+            {'name': 'My cool App', 'version_count': 4, 'major_sum': 5},
+        ]
+
     def test_apply_to(self, tags):
         queryset_without_properties = ApplicationTag.objects.all()
         assert not isinstance(queryset_without_properties, QueryablePropertiesQuerySetMixin)
@@ -95,6 +107,22 @@ class TestQueryablePropertiesQuerySetMixin(object):
         assert list(queryset_without_properties) == list(queryset)
         assert set(queryset.filter(applications__version_count=4)) == set(tags)
 
+    def test_apply_to_queryable_queryset(self):
+        base_queryset = ApplicationWithClassBasedProperties.objects.select_properties('version_count')
+        queryset = QueryablePropertiesQuerySetMixin.apply_to(base_queryset)
+        assert queryset is not base_queryset
+        # Re-applying the mixin must keep the queryable property state of the
+        # query intact.
+        assert queryset.query._queryable_property_annotations == base_queryset.query._queryable_property_annotations
+        queryset = QueryablePropertiesQuerySetMixin.apply_to(queryset.select_properties('major_sum'))
+        applications = list(queryset)
+        assert len(applications) == 2
+        for application in applications:
+            assert ApplicationWithClassBasedProperties.version_count.has_cached_value(application)
+            assert application.version_count == 4
+            assert ApplicationWithClassBasedProperties.major_sum.has_cached_value(application)
+            assert application.major_sum == 5
+
 
 class TestQueryablePropertiesQuerySet(object):
 
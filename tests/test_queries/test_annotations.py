@@ -36,6 +36,17 @@ class TestAggregateAnnotations(object):
             assert application.major_sum == 5
             assert not hasattr(application, QUERYING_PROPERTIES_MARKER)
 
+    @pytest.mark.skipif(DJANGO_VERSION < (1, 6), reason="CaptureQueriesContext didn't exist before Django 1.6")
+    @pytest.mark.parametrize('model', [ApplicationWithClassBasedProperties, ApplicationWithDecoratorBasedProperties])
+    def test_cached_annotation_value_no_additional_queries(self, model):
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            for application in model.objects.select_properties('version_count', 'major_sum'):
+                assert application.version_count == 4
+                assert application.major_sum == 5
+        assert len(context.captured_queries) == 1
+
     @pytest.mark.parametrize('model, limit, expected_total', [
         (ApplicationWithClassBasedProperties, None, 8),
         (ApplicationWithClassBasedProperties, 1, 4),
@@ -117,6 +128,17 @@ class TestAggregateAnnotations(object):
             counter += 1
         assert counter == 2
 
+    @pytest.mark.skipif(DJANGO_VERSION < (1, 7), reason="Raw queries didn't exist before Django 1.7")
+    @pytest.mark.parametrize('model', [ApplicationWithClassBasedProperties, ApplicationWithDecoratorBasedProperties])
+    def test_raw_query_without_marker(self, model):
+        pks = set(model.objects.values_list('pk', flat=True))
+        queryset = model.objects.raw('SELECT id, name FROM {}'.format(model._meta.db_table))
+        # Iterating the query directly doesn't set up the marker, so the rows
+        # must be passed through unchanged.
+        rows = list(queryset.query)
+        assert all(len(row) == 2 for row in rows)
+        assert set(row[0] for row in rows) == pks
+
 
 @pytest.mark.skipif(DJANGO_VERSION < (1, 8), reason="Expression-based annotations didn't exist before Django 1.8")
 class TestExpressionAnnotations(object):
@@ -134,6 +156,15 @@ class TestExpressionAnnotations(object):
         assert 'version' in queryset.query.annotations
         assert all(model.version.has_cached_value(obj) for obj in queryset)
 
+    @pytest.mark.parametrize('model', [VersionWithClassBasedProperties, VersionWithDecoratorBasedProperties])
+    def test_cached_annotation_value_no_additional_queries(self, model):
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            for version in model.objects.select_properties('version'):
+                assert version.version == '{}.{}.{}'.format(version.major, version.minor, version.patch)
+        assert len(context.captured_queries) == 1
+
     @pytest.mark.parametrize('model, property_name, annotation, expected_count, record_checker', [
         (VersionWithClassBasedProperties, 'version', models.F('version'), 8,
          lambda obj: obj.annotation == obj.version),
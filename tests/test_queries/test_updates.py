@@ -14,9 +14,9 @@ def test_simple_update(model):
     queryset = model.objects.filter(major_minor='2.0')
     pks = list(queryset.values_list('pk', flat=True))
     assert queryset.update(major_minor='42.42') == len(pks)
-    for pk in pks:
-        version = model.objects.get(pk=pk)  # Reload from DB
-        assert version.major_minor == '42.42'
+    versions = model.objects.filter(pk__in=pks)  # Reload from DB
+    assert len(versions) == len(pks)
+    assert all(version.major_minor == '42.42' for version in versions)
 
 
 @pytest.mark.parametrize('model, update_kwargs', [
@@ -31,9 +31,9 @@ def test_update_based_on_other_property(model, update_kwargs):
     queryset = model.objects.filter(version='1.3.1')
     pks = list(queryset.values_list('pk', flat=True))
     assert queryset.update(**update_kwargs) == len(pks)
-    for pk in pks:
-        version = model.objects.get(pk=pk)  # Reload from DB
-        assert version.version == update_kwargs['version']
+    versions = model.objects.filter(pk__in=pks)  # Reload from DB
+    assert len(versions) == len(pks)
+    assert all(version.version == update_kwargs['version'] for version in versions)
 
 
 @pytest.mark.skipif(DJANGO_VERSION < (1, 8), reason="Conditional expressions didn't exist before Django 1.8")
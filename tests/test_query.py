@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import six
 from django import VERSION as DJANGO_VERSION
+from django.db.models import Q
 
+from queryable_properties.compat import (
+    ADD_Q_METHOD_NAME, BUILD_FILTER_METHOD_NAME, NAMES_TO_PATH_METHOD_NAME, chain_query,
+)
 from queryable_properties.query import (
     QUERYING_PROPERTIES_MARKER, AggregatePropertyChecker, QueryablePropertiesCompilerMixin,
+    QueryablePropertiesQueryMixin,
 )
+from queryable_properties.utils.internal import QueryablePropertyReference, QueryPath
 from .app_management.models import (
     ApplicationWithClassBasedProperties, CategoryWithClassBasedProperties, VersionWithClassBasedProperties,
 )
@@ -39,3 +46,95 @@ class TestQueryablePropertiesCompilerMixin(object):
         compiler = QueryablePropertiesCompilerMixin.inject_into_object(queryset.query.get_compiler(using=queryset.db))
         compiler.setup_query()
         assert tuple(compiler.annotation_col_map) == (QUERYING_PROPERTIES_MARKER, 'version_count')
+
+
+class TestQueryablePropertiesQueryMixin(object):
+
+    @pytest.mark.skipif(DJANGO_VERSION < (1, 8), reason="Attribute redirects are only required before Django 1.8")
+    def test_no_attribute_redirects(self):
+        assert not hasattr(QueryablePropertiesQueryMixin, '__getattr__')
+
+    @pytest.mark.skipif(DJANGO_VERSION < (2, 0), reason="Queries were chained via clone before Django 2.0")
+    def test_no_clone_override(self):
+        assert 'clone' not in QueryablePropertiesQueryMixin.__dict__
+
+    @pytest.mark.skipif(DJANGO_VERSION < (1, 6), reason="Old versions require overrides for filters and joins")
+    def test_no_legacy_overrides(self):
+        assert 'add_filter' not in QueryablePropertiesQueryMixin.__dict__
+        assert 'setup_joins' not in QueryablePropertiesQueryMixin.__dict__
+
+    def test_base_methods(self):
+        query_class = ApplicationWithClassBasedProperties.objects.all().query.__class__
+        base_class = query_class.__bases__[-1]
+        for attr_name, method_name in (('_base_build_filter', BUILD_FILTER_METHOD_NAME),
+                                       ('_base_names_to_path', NAMES_TO_PATH_METHOD_NAME)):
+            expected_function = six.get_unbound_function(getattr(base_class, method_name))
+            assert six.get_unbound_function(getattr(query_class, attr_name)) is expected_function
+        assert not hasattr(query_class, '_base_add_q')
+
+    def test_add_q_override(self):
+        query = VersionWithClassBasedProperties.objects.all().query
+        base_method = getattr(query.__class__, ADD_Q_METHOD_NAME)
+        q_objects = []
+
+        def add_q(self, q_object, *args, **kwargs):
+            q_objects.append(q_object)
+            return base_method(self, q_object, *args, **kwargs)
+
+        # Filters of queryable properties must be applied via the (_)add_q
+        # method of the query itself to respect overrides in subclasses.
+        query.__class__ = type('CustomQuery', (query.__class__,), {ADD_Q_METHOD_NAME: add_q})
+        query.add_q(Q(version='1.2.3'))
+        assert any(('patch', '3') in q_object.children for q_object in q_objects)
+
+    def test_resolve_queryable_property(self):
+        query = ApplicationWithClassBasedProperties.objects.all().query
+        path = QueryPath('versions__version__lower')
+        result = query._resolve_queryable_property(path)
+        assert result == (QueryablePropertyReference(VersionWithClassBasedProperties.version.prop,
+                                                     VersionWithClassBasedProperties, QueryPath('versions')),
+                          QueryPath('lower'))
+        assert query._queryable_property_resolutions == {path: result}
+        assert query._resolve_queryable_property(QueryPath('versions__version__lower')) is result
+        assert query._resolve_queryable_property('versions__version__lower') == result
+        assert query._queryable_property_resolutions['versions__version__lower'] == result
+        assert query._resolve_queryable_property(QueryPath('name')) == (None, QueryPath())
+        # Clones share the cache until they resolve new paths, which must not
+        # end up in the original query.
+        clone = chain_query(query)
+        assert clone._queryable_property_resolutions == query._queryable_property_resolutions
+        assert clone._resolve_queryable_property(QueryPath('version_count'))[0] is not None
+        assert len(clone._queryable_property_resolutions) == 4
+        assert len(query._queryable_property_resolutions) == 3
+        # The original query must not add entries to the clone's cache either.
+        assert query._resolve_queryable_property(QueryPath('major_sum'))[0] is not None
+        assert len(query._queryable_property_resolutions) == 4
+        assert len(clone._queryable_property_resolutions) == 4
+        assert QueryPath('major_sum') not in clone._queryable_property_resolutions
+
+    def test_queryable_property_annotations(self):
+        queryset = VersionWithClassBasedProperties.objects.order_by('application__version_count')
+        ref = QueryablePropertyReference(ApplicationWithClassBasedProperties.version_count.prop,
+                                         ApplicationWithClassBasedProperties, QueryPath('application'))
+        assert queryset.query._queryable_property_annotations == {ref: 'application__version_count'}
+        clone = chain_query(queryset.query)
+        assert clone._queryable_property_annotations is queryset.query._queryable_property_annotations
+        assert clone._queryable_property_stack == []
+        assert clone._queryable_property_stack is not queryset.query._queryable_property_stack
+        clone.add_ordering('application__major_sum')
+        assert queryset.query._queryable_property_annotations == {ref: 'application__version_count'}
+        assert len(clone._queryable_property_annotations) == 2
+
+    def test_queryable_property_stack_top(self):
+        query = ApplicationWithClassBasedProperties.objects.all().query
+        ref1 = QueryablePropertyReference(ApplicationWithClassBasedProperties.version_count.prop,
+                                          ApplicationWithClassBasedProperties, QueryPath())
+        ref2 = QueryablePropertyReference(ApplicationWithClassBasedProperties.major_sum.prop,
+                                          ApplicationWithClassBasedProperties, QueryPath())
+        assert query._queryable_property_stack_top is None
+        with query._add_queryable_property_annotation(ref1, False):
+            assert query._queryable_property_stack_top is ref1
+            with query._add_queryable_property_annotation(ref2, False):
+                assert query._queryable_property_stack_top is ref2
+            assert query._queryable_property_stack_top is ref1
+        assert query._queryable_property_stack_top is None
@@ -70,6 +70,10 @@ class TestQueryPath(object):
         query_path = QueryPath(path)
         assert query_path == expected_result
 
+    def test_constructor_query_path(self):
+        query_path = QueryPath('a__b')
+        assert QueryPath(query_path) is query_path
+
     @pytest.mark.parametrize('query_path, addition, expected_result', [
         (QueryPath(), QueryPath(['a']), QueryPath(('a',))),
         (QueryPath('a'), ('b', 'c'), QueryPath(('a', 'b', 'c'))),
@@ -151,6 +155,12 @@ class TestInjectableMixin(object):
         assert isinstance(cls, base_class.__class__)
         assert isinstance(cls, mixin_class.__class__)
 
+    def test_mix_with_class_attrs(self, monkeypatch):
+        monkeypatch.setattr(DummyMixin, '_created_classes', {})
+        monkeypatch.setattr(DummyMixin, '_get_class_attrs', classmethod(lambda cls, base_class: {'base': base_class}))
+        cls = DummyMixin.mix_with_class(DummyClass)
+        assert cls.base is DummyClass
+
     @pytest.mark.parametrize('init', [True, False])
     def test_inject_into_object(self, init):
         obj = DummyClass(5, 'abc')
@@ -243,6 +253,23 @@ class TestNodeModifier(object):
         assert len(result.children) == 2
         assert result.children[0].children == [('new_a', expected_a), ('new_b', expected_b)]
         assert result.children[1] == ('new_c', expected_c)
+        if copy:
+            assert q.children[0].children == [('a', 1), ('b', 2)]
+            assert q.children[1] == ('c', 3)
+
+    def test_copy_branches(self):
+        value = [1, 2]
+        inner_q = Q(a=value) | Q(b=2)
+        q = Q(inner_q, c=3)
+        result = NodeModifier.copy_branches(q)
+        assert result is not q
+        assert result.children is not q.children
+        assert result.children[0] is not inner_q
+        assert result.children[0].children is not inner_q.children
+        assert result.children[0].connector == inner_q.connector
+        assert result.children[0].children == inner_q.children
+        assert result.children[0].children[0][1] is value
+        assert result.children[1] == q.children[1]
 
 
 class TestModelAttributeGetter(object):
@@ -518,6 +545,19 @@ class TestResolveQueryableProperty(object):
     def test_unsuccessful(self, model, query_path):
         assert resolve_queryable_property(model, query_path) == (None, QueryPath())
 
+    @pytest.mark.parametrize('model, query_path', [
+        (VersionWithClassBasedProperties, QueryPath('non_existent')),
+        (VersionWithDecoratorBasedProperties, QueryPath('non_existent__exact')),
+        (ApplicationWithClassBasedProperties, QueryPath('versions__objects')),
+        (ApplicationWithDecoratorBasedProperties, QueryPath('versions__objects')),
+    ])
+    def test_unsuccessful_without_exception(self, monkeypatch, model, query_path):
+        def fail(*args, **kwargs):
+            raise AssertionError('QueryablePropertyDoesNotExist must not be raised.')
+
+        monkeypatch.setattr(QueryablePropertyDoesNotExist, '__init__', fail)
+        assert resolve_queryable_property(model, query_path) == (None, QueryPath())
+
 
 class TestGetOutputField(object):
 